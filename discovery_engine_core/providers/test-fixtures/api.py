@@ -1,12 +1,14 @@
 #!/usr/bin/env python3
 
+from concurrent.futures import ThreadPoolExecutor
 import requests
 import json
 import os
 
-headers = {
+session = requests.Session()
+session.headers.update({
     "Authorization": "Bearer " + os.environ["API_GATEWAY_TOKEN"],
-}
+})
 
 url = "https://api-gw.xaynet.dev/_sn"
 
@@ -27,9 +29,14 @@ queries = {
     },
 }
 
-for (key, params) in queries.items():
-    response = requests.request("GET", url, headers=headers, params=params)
-    data = json.loads(response.text)
+with ThreadPoolExecutor(max_workers=len(queries)) as executor:
+    responses = {
+        key: executor.submit(session.get, url, params=params)
+        for (key, params) in queries.items()
+    }
+
+for (key, response) in responses.items():
+    data = json.loads(response.result().content)
 
     for article in data["articles"]:
         article["author"] = "Anonymous"
@@ -2,8 +2,9 @@ import os
 from argparse import ArgumentParser
 import onnx
 from onnx import helper, TensorProto, GraphProto
+from typing import Dict, Optional
 
-def create_mock_onnx_model(model_path: str, graph_def: GraphProto) -> None:
+def create_mock_onnx_model(model_path: str, graph_def: GraphProto, check: bool = True) -> None:
     '''
     Create a mock onnx model.
     '''
@@ -14,8 +15,9 @@ def create_mock_onnx_model(model_path: str, graph_def: GraphProto) -> None:
         opset_imports=[helper.make_opsetid('', 12)],
     )
 
-    onnx.checker.check_model(model_def)
-    print(f"The model is checked: \N{heavy check mark}")
+    if check:
+        onnx.checker.check_model(model_def)
+        print(f"The model is checked: \N{heavy check mark}")
 
     onnx.save(model_def, model_path)
     print(f"The model is saved under {model_path}: \N{heavy check mark}")
@@ -178,15 +180,55 @@ def create_kpe_graph() -> GraphProto:
         outputs,
     )
 
-def verify(model_path: str):
+def session_providers(model_path: str) -> list:
     '''
-    Verify the model.
+    Get the available execution providers in priority order, with TensorRT
+    engines cached per model so that repeated verifications skip the rebuild.
     '''
     import onnxruntime as rt
 
+    providers = rt.get_available_providers()
+    provider_options = {}
+    if 'TensorrtExecutionProvider' in providers:
+        # tensorrt doesn't create missing parent dirs, so make sure the cache dir exists
+        cache_path = os.path.join(
+            os.path.dirname(os.path.abspath(__file__)),
+            '.ort_cache',
+            os.path.basename(model_path),
+        )
+        os.makedirs(cache_path, exist_ok=True)
+        provider_options['TensorrtExecutionProvider'] = {
+            'trt_engine_cache_enable': 'True',
+            'trt_engine_cache_path': cache_path,
+        }
+    return [
+        (provider, provider_options.get(provider, {}))
+        for provider in providers
+    ]
+
+def verify(model_path: str, dim_overrides: Optional[Dict[str, int]] = None):
+    '''
+    Verify the model, optionally pinning its free dimensions to fixed values.
+    '''
+    import onnxruntime as rt
+
+    # only the model's signature is inspected, so skip the graph optimizations, unless dims are
+    # pinned: the basic optimizations are needed to propagate the pinned sizes to the outputs
+    options = rt.SessionOptions()
+    if dim_overrides:
+        options.graph_optimization_level = rt.GraphOptimizationLevel.ORT_ENABLE_BASIC
+        for (dim, value) in dim_overrides.items():
+            options.add_free_dimension_override_by_name(dim, value)
+    else:
+        options.graph_optimization_level = rt.GraphOptimizationLevel.ORT_DISABLE_ALL
+
     print(f"Checking ONNX model loading from: {model_path} ...")
     try:
-        sess = rt.InferenceSession(model_path, providers=rt.get_available_providers())
+        sess = rt.InferenceSession(
+            model_path,
+            options,
+            providers=session_providers(model_path),
+        )
         for inp in sess.get_inputs():
             print("  input name='{}'\n    shape={}\n    type={}".format(inp.name, inp.shape, inp.type))
         for out in sess.get_outputs():
@@ -209,6 +251,28 @@ if __name__ == '__main__':
         required=True,
         help="Type of the model.",
     )
+    parser.add_argument(
+        "--skip-check",
+        action="store_true",
+        help="Skip checking the model with the onnx checker before saving it.",
+    )
+    parser.add_argument(
+        "--skip-verify",
+        action="store_true",
+        help="Skip loading the saved model with onnxruntime.",
+    )
+    parser.add_argument(
+        "--batch",
+        type=int,
+        required=False,
+        help="Fixed batch size to verify the model with (ex: 1).",
+    )
+    parser.add_argument(
+        "--sequence",
+        type=int,
+        required=False,
+        help="Fixed sequence length to verify the model with (ex: 64).",
+    )
 
     args = parser.parse_args()
     model_path = os.path.abspath(args.output or os.path.curdir)
@@ -227,8 +291,14 @@ if __name__ == '__main__':
     try:
         print("\n====== Converting model to ONNX ======")
         graph_def = create_graph_choices.get(args.type)()
-        create_mock_onnx_model(model_path, graph_def)
-        verify(model_path)
+        create_mock_onnx_model(model_path, graph_def, not args.skip_check)
+        if not args.skip_verify:
+            dim_overrides = {
+                dim: value
+                for (dim, value) in [("batch", args.batch), ("sequence", args.sequence)]
+                if value is not None
+            }
+            verify(model_path, dim_overrides)
     except Exception as e:
         print(f"Error while converting the model: {e}")
         exit(1)